@@ -1,19 +1,78 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 import os
 
+# Public placeholder secrets; only acceptable with the mock database
+DEFAULT_SESSION_SIGNING_KEYS = "dev:change-me-session-secret"
+DEFAULT_UPLOAD_SIGNING_SECRET = "change-me-upload-secret"
+
 class Settings(BaseSettings):
     GCP_PROJECT_ID: str = "demo-project"
     FIREBASE_CREDENTIALS_PATH: str = "./firebase-credentials.json"
     GCS_BUCKET_NAME: str = "demo-bucket"
     CORS_ORIGINS: str = "http://localhost:8080,http://localhost:5173"
     ADMIN_PASSWORD: str = "admin123"
+    # Per-judge logins as "judge:password" pairs; when empty, any judge id is
+    # accepted with ADMIN_PASSWORD
+    JUDGE_PASSWORDS: str = ""
     USE_MOCK_DB: bool = True  # Set to False when Firebase is configured
+    # Session token keys as "kid:secret" pairs; the first one signs new tokens
+    SESSION_SIGNING_KEYS: str = DEFAULT_SESSION_SIGNING_KEYS
+    SESSION_TTL_SECONDS: int = 12 * 3600
+    SESSION_CACHE_SIZE: int = 4096
+    UPLOAD_SIGNING_SECRET: str = DEFAULT_UPLOAD_SIGNING_SECRET  # Signs mock storage upload URLs
+    UPLOAD_URL_EXPIRY_SECONDS: int = 900
+    PDF_MAX_BYTES: int = 20 * 1024 * 1024
+    PDF_WORKERS: int = 2  # Processes used to parse uploaded PDFs
+    PDF_QUEUE_SIZE: int = 100  # Uploads are rejected with 503 once this many are waiting
+    PDF_MAX_RETRIES: int = 3
+    PDF_RETRY_BASE_DELAY: float = 1.0  # Seconds, doubled on every retry
+    PDF_PARSE_TIMEOUT_SECONDS: float = 60.0  # A parse running longer counts as a failed attempt
+    PDF_TEXT_MAX_CHARS: int = 200000
+    BLOB_GC_INTERVAL_SECONDS: float = 10.0  # How often deleted PDFs are swept from storage
+    BLOB_GC_BATCH_SIZE: int = 100  # GCS allows at most 100 calls per batch request
+    BLOB_GC_MAX_ATTEMPTS: int = 5
+    BLOB_RECONCILE_INTERVAL_SECONDS: float = 3600.0
+    BLOB_ORPHAN_GRACE_SECONDS: int = 24 * 3600  # Unreferenced PDFs younger than this are kept
+    DUPLICATE_SIMILARITY: float = 0.6  # Estimated Jaccard similarity flagged as duplicate
+    SCORE_WEIGHTS: str = ""  # e.g. "innovation:1.5,uiUx:0.5" (unlisted criteria weigh 1)
     
     @property
     def CORS_ORIGINS_LIST(self) -> List[str]:
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
     
+    @property
+    def SESSION_SIGNING_KEYS_MAP(self) -> Dict[str, str]:
+        keys = {}
+        for item in self.SESSION_SIGNING_KEYS.split(","):
+            if ":" in item:
+                kid, secret = item.split(":", 1)
+                keys[kid.strip()] = secret.strip()
+        return keys
+    
+    @property
+    def JUDGE_PASSWORDS_MAP(self) -> Dict[str, str]:
+        judges = {}
+        for item in self.JUDGE_PASSWORDS.split(","):
+            if ":" in item:
+                judge_id, password = item.split(":", 1)
+                judges[judge_id.strip()] = password.strip()
+        return judges
+    
+    def require_secret(self, name: str, default: str):
+        """Refuse to use a placeholder secret outside mock mode"""
+        if not self.USE_MOCK_DB and getattr(self, name) == default:
+            raise RuntimeError(f"{name} must be set when USE_MOCK_DB is False")
+    
+    @property
+    def SCORE_WEIGHTS_MAP(self) -> Dict[str, float]:
+        weights = {}
+        for item in self.SCORE_WEIGHTS.split(","):
+            if ":" in item:
+                name, weight = item.split(":", 1)
+                weights[name.strip()] = float(weight)
+        return weights
+    
     class Config:
         env_file = ".env"
         extra = "allow"
@@ -1,9 +1,14 @@
 from fastapi import Header, HTTPException, status
-from app.services.firebase import get_db
+from app.services.tokens import get_token_signer, InvalidTokenError
 from typing import Optional
 
+def _verify_token(authorization: str) -> dict:
+    # Extract token (format: "Bearer <token>")
+    token = authorization.split(" ")[1] if " " in authorization else authorization
+    return get_token_signer().verify(token)
+
 async def get_current_user(authorization: Optional[str] = Header(None)):
-    """Verify team session from custom token"""
+    """Verify team session from signed token"""
     if not authorization:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -11,19 +16,12 @@ async def get_current_user(authorization: Optional[str] = Header(None)):
         )
     
     try:
-        # Extract token (format: "Bearer <token>")
-        token = authorization.split(" ")[1] if " " in authorization else authorization
-        
-        # For demo: decode simple token format "teamId:email"
-        # In production: use Firebase Custom Tokens or JWT
-        parts = token.split(":")
-        if len(parts) != 2:
-            raise ValueError("Invalid token format")
-        
-        team_id, email = parts
-        return {"teamId": team_id, "email": email}
+        claims = _verify_token(authorization)
+        if claims.get("role") != "team":
+            raise InvalidTokenError("Not a team token")
+        return {"teamId": claims["teamId"], "email": claims["email"]}
     
-    except Exception:
+    except (InvalidTokenError, KeyError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token"
@@ -38,15 +36,12 @@ async def verify_admin(authorization: Optional[str] = Header(None)):
         )
     
     try:
-        token = authorization.split(" ")[1] if " " in authorization else authorization
-        
-        # Simple admin check - enhance with Firebase Admin SDK in production
-        if token != "admin_token":
-            raise ValueError("Invalid admin token")
-        
-        return {"role": "admin"}
+        claims = _verify_token(authorization)
+        if claims.get("role") != "admin" or not claims.get("judgeId"):
+            raise InvalidTokenError("Not an admin token")
+        return {"role": "admin", "judgeId": claims["judgeId"]}
     
-    except Exception:
+    except InvalidTokenError:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required"
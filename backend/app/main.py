@@ -1,10 +1,26 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.config import settings
-from app.routes import auth, projects, admin
-from app.services.firebase import initialize_firebase
+from app.config import settings, DEFAULT_UPLOAD_SIGNING_SECRET
+from app.routes import auth, projects, admin, storage
+from app.services.firebase import initialize_firebase, get_project_documents
+from app.services.blob_gc import blob_collector
+from app.services.pdf_pipeline import pdf_pipeline, pending_jobs
+from app.services.duplicates import load_duplicate_index
+from app.services.leaderboard import load_leaderboard
+from app.services.scoring import load_score_engine
+from app.services.storage import GCS_AVAILABLE
+from app.services.tokens import get_token_signer
 
-app = FastAPI(title="RepoHandler API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await pdf_pipeline.start(pending_pdfs)
+    await blob_collector.start()
+    yield
+    await blob_collector.stop()
+    await pdf_pipeline.stop()
+
+app = FastAPI(title="RepoHandler API", version="1.0.0", lifespan=lifespan)
 
 # CORS
 app.add_middleware(
@@ -15,13 +31,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Refuse to start with placeholder secrets outside mock mode
+get_token_signer()
+if not GCS_AVAILABLE:
+    # Uploads fall back to the signed mock storage endpoint
+    settings.require_secret("UPLOAD_SIGNING_SECRET", DEFAULT_UPLOAD_SIGNING_SECRET)
+
 # Initialize Firebase
 initialize_firebase()
 
+# Build in-memory indexes from a single pass over the store
+project_docs = get_project_documents()
+load_score_engine(project_docs)
+load_leaderboard(project_docs)
+load_duplicate_index(project_docs)
+pending_pdfs = pending_jobs(project_docs)
+del project_docs
+
 # Routes
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(projects.router, prefix="/api/projects", tags=["projects"])
 app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
+app.include_router(storage.router, prefix="/mock-storage", tags=["storage"])
 
 @app.get("/")
 def root():
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, HttpUrl
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 class Feature(BaseModel):
@@ -42,8 +42,14 @@ class Project(BaseModel):
     teamMembers: Optional[List[TeamMember]] = []  # Optional for backward compatibility
     promptPdfName: Optional[str] = None
     promptPdfUrl: Optional[str] = None
-    scores: Optional[Scores] = None  # Scoring by admin
-    totalScore: Optional[float] = None  # Calculated total
+    promptPdfStatus: Optional[str] = None  # queued, processing, ready, invalid or failed
+    promptPdfPages: Optional[int] = None
+    promptPdfHash: Optional[str] = None  # SHA-256 of the file content
+    promptPdfTextIndexed: Optional[bool] = None
+    promptPdfError: Optional[str] = None
+    scores: Optional[Scores] = None  # Mean of all judges' scores
+    judgeScores: Optional[Dict[str, Scores]] = None  # Scores keyed by judge
+    totalScore: Optional[float] = None  # Weighted total of the mean scores
     submittedAt: str
     
     class Config:
@@ -54,6 +60,11 @@ class ScoresUpdate(BaseModel):
     feasibility: float
     uiUx: float
     promptEfficiency: float
+    judgeId: str  # Must match the judge in the admin session
+
+class UploadComplete(BaseModel):
+    blobName: str
+    filename: Optional[str] = None
 
 class TeamSession(BaseModel):
     teamId: str
@@ -64,3 +75,4 @@ class TeamCreate(BaseModel):
 
 class AdminLogin(BaseModel):
     password: str
+    judgeId: str
@@ -1,17 +1,20 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from app.models import Project, ScoresUpdate
 from app.dependencies import verify_admin
 from app.services.firebase import get_db
+from app.services.duplicates import get_duplicate_index
+from app.services.leaderboard import get_leaderboard
+from app.services.scoring import get_score_engine, judge_scores_from_doc, aggregate_scores
+from app.services.singleflight import SingleFlight
 from typing import List, Optional
+import asyncio
 
 router = APIRouter()
 
-@router.get("/projects", response_model=List[Project])
-async def get_all_projects(
-    search: Optional[str] = Query(None),
-    admin: dict = Depends(verify_admin)
-):
-    """Get all projects (admin only)"""
+# Concurrent identical full scans share a single Firestore read
+admin_reads = SingleFlight()
+
+def _load_projects(search: Optional[str]) -> List[Project]:
     db = get_db()
     projects_ref = db.collection('projects')
     
@@ -22,11 +25,10 @@ async def get_all_projects(
         
         # Apply search filter if provided
         if search:
-            search_lower = search.lower()
             if not any([
-                search_lower in data.get('name', '').lower(),
-                search_lower in data.get('teamId', '').lower(),
-                search_lower in data.get('email', '').lower()
+                search in data.get('name', '').lower(),
+                search in data.get('teamId', '').lower(),
+                search in data.get('email', '').lower()
             ]):
                 continue
         
@@ -37,6 +39,18 @@ async def get_all_projects(
     
     return projects
 
+@router.get("/projects", response_model=List[Project])
+async def get_all_projects(
+    search: Optional[str] = Query(None),
+    admin: dict = Depends(verify_admin)
+):
+    """Get all projects (admin only)"""
+    search = (search or '').strip().lower() or None
+    return await admin_reads.do(
+        ("projects", search),
+        lambda: asyncio.to_thread(_load_projects, search)
+    )
+
 @router.put("/projects/{project_id}/scores")
 async def update_project_scores(
     project_id: str,
@@ -49,44 +63,111 @@ async def update_project_scores(
     doc = doc_ref.get()
     
     if not doc.exists:
-        from fastapi import HTTPException, status
         raise HTTPException(status_code=404, detail="Project not found")
     
-    # Calculate total score
-    total_score = (
-        scores.innovation + 
-        scores.feasibility + 
-        scores.uiUx + 
-        scores.promptEfficiency
-    )
+    # Judges can only write their own row
+    if scores.judgeId != admin['judgeId']:
+        raise HTTPException(status_code=403, detail="Scores can only be submitted as the signed-in judge")
     
-    # Update project with scores
-    scores_dict = scores.model_dump()
+    # Record this judge's scores alongside any other judges' scores
+    existing_data = doc.to_dict()
+    stored_rows = existing_data.get('judgeScores') or {}
+    judge_row = scores.model_dump(exclude={'judgeId'})
+    judge_scores = {**judge_scores_from_doc(existing_data), scores.judgeId: judge_row}
+    aggregate = aggregate_scores(judge_scores)
+    score_fields = {
+        'scores': aggregate['mean'],
+        'totalScore': aggregate['totalScore']
+    }
+    
+    # Write only this judge's entry (plus legacy scores not yet migrated)
+    # as field paths, so judges scoring at the same time keep their rows
+    new_rows = {
+        judge_id: row for judge_id, row in judge_scores.items()
+        if judge_id == scores.judgeId or judge_id not in stored_rows
+    }
     doc_ref.update({
-        'scores': scores_dict,
-        'totalScore': total_score
+        **{f'judgeScores.{judge_id}': row for judge_id, row in new_rows.items()},
+        **score_fields
     })
     
+    # In-memory indexes change only once the store has accepted the write
+    engine = get_score_engine()
+    engine.set_scores(project_id, scores.judgeId, judge_row)
+    summary = engine.project_summary(project_id)
+    get_leaderboard().update(project_id, {**existing_data, **score_fields})
+    
     return {
         "message": "Scores updated successfully",
-        "scores": scores_dict,
-        "totalScore": total_score
+        "judgeId": scores.judgeId,
+        "scores": score_fields['scores'],
+        "totalScore": score_fields['totalScore'],
+        "normalizedScore": summary['normalizedScore'],
+        "judgesScored": summary['judgesScored']
     }
 
-@router.get("/stats")
-async def get_stats(admin: dict = Depends(verify_admin)):
-    """Get submission statistics"""
+@router.get("/rankings")
+async def get_rankings(
+    normalized: bool = Query(False),
+    limit: Optional[int] = Query(None, ge=1),
+    admin: dict = Depends(verify_admin)
+):
+    """Rank scored projects by weighted total (optionally judge-normalized)"""
+    return get_score_engine().rankings(normalized=normalized, limit=limit)
+
+@router.get("/leaderboard")
+async def get_leaderboard_page(
+    limit: int = Query(20, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    admin: dict = Depends(verify_admin)
+):
+    """Get a page of scored projects in rank order"""
+    leaderboard = get_leaderboard()
+    return {
+        "total": len(leaderboard),
+        "limit": limit,
+        "offset": offset,
+        "entries": leaderboard.page(limit, offset)
+    }
+
+@router.get("/leaderboard/{project_id}")
+async def get_leaderboard_entry(
+    project_id: str,
+    admin: dict = Depends(verify_admin)
+):
+    """Get the current rank of a single project"""
+    entry = get_leaderboard().entry(project_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Project not on leaderboard")
+    return entry
+
+@router.get("/duplicates")
+async def get_duplicates(admin: dict = Depends(verify_admin)):
+    """Get clusters of projects that share a repository or near-identical text"""
+    return get_duplicate_index().clusters()
+
+def _compute_stats() -> dict:
     db = get_db()
     projects_ref = db.collection('projects')
     
-    all_projects = list(projects_ref.stream())
+    all_projects = [doc.to_dict() for doc in projects_ref.stream()]
     
     # Count projects with scores
-    projects_with_scores = sum(1 for doc in all_projects if doc.to_dict().get('scores'))
+    projects_with_scores = sum(1 for data in all_projects if data.get('scores'))
     
     return {
         "totalProjects": len(all_projects),
-        "teamsWithProjects": len(set(doc.to_dict().get('teamId') for doc in all_projects)),
-        "projectsWithPdf": sum(1 for doc in all_projects if doc.to_dict().get('promptPdfName')),
+        "teamsWithProjects": len(set(data.get('teamId') for data in all_projects)),
+        "projectsWithPdf": sum(1 for data in all_projects if data.get('promptPdfName')),
         "projectsScored": projects_with_scores
     }
+
+@router.get("/stats")
+async def get_stats(admin: dict = Depends(verify_admin)):
+    """Get submission statistics"""
+    return await admin_reads.do(("stats",), lambda: asyncio.to_thread(_compute_stats))
+
+@router.get("/coalescing-stats")
+async def get_coalescing_stats(admin: dict = Depends(verify_admin)):
+    """Get counters for coalesced admin reads"""
+    return admin_reads.stats()
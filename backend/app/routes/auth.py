@@ -3,11 +3,18 @@ from fastapi.responses import JSONResponse
 from app.models import TeamSession, AdminLogin, TeamCreate
 from app.config import settings
 from app.services.firebase import get_db
+from app.services.scoring import LEGACY_JUDGE_ID
+from app.services.tokens import issue_team_token, issue_admin_token
+import hmac
+import re
 import uuid
 from datetime import datetime
 
 router = APIRouter()
 
+# Judge ids are used as Firestore field names, so keep them to a safe charset
+JUDGE_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
 @router.post("/generate-team")
 async def generate_team(team: TeamCreate):
     """Generate a new team ID for team leader"""
@@ -46,8 +53,8 @@ async def generate_team(team: TeamCreate):
     
     db.collection('teams').document(team_id).set(team_data)
     
-    # Generate token
-    token = f"{team_id}:{team.leaderEmail}"
+    # Generate signed session token
+    token = issue_team_token(team_id, team.leaderEmail)
     
     return {
         "teamId": team_id,
@@ -66,8 +73,17 @@ async def team_login(session: TeamSession):
             detail="Invalid team ID"
         )
     
-    # Generate simple token (enhance with JWT in production)
-    token = f"{session.teamId}:{session.email}"
+    # Only the team's leader email can sign in as the team
+    db = get_db()
+    team_doc = db.collection('teams').document(session.teamId.strip()).get()
+    if not team_doc.exists or team_doc.to_dict().get('leaderEmail', '').lower() != session.email.lower():
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid team ID or email"
+        )
+    
+    # Generate signed session token
+    token = issue_team_token(session.teamId.strip(), session.email)
     
     return {
         "token": token,
@@ -78,13 +94,36 @@ async def team_login(session: TeamSession):
 @router.post("/admin-login")
 async def admin_login(credentials: AdminLogin):
     """Authenticate admin"""
-    if credentials.password != settings.ADMIN_PASSWORD:
+    judge_id = credentials.judgeId.strip()
+    if not JUDGE_ID_PATTERN.fullmatch(judge_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Judge ID must be 1-64 letters, digits, '-' or '_'"
+        )
+    
+    # Scores saved before per-judge scoring belong to this id
+    if judge_id == LEGACY_JUDGE_ID:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="This judge ID is reserved"
+        )
+    
+    # With per-judge passwords configured, each judge signs in with their own;
+    # otherwise the shared admin password is used and the judge id is
+    # self-asserted
+    judge_passwords = settings.JUDGE_PASSWORDS_MAP
+    if judge_passwords:
+        expected = judge_passwords.get(judge_id, "")
+    else:
+        expected = settings.ADMIN_PASSWORD
+    if not expected or not hmac.compare_digest(credentials.password.encode(), expected.encode()):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid admin password"
         )
     
     return {
-        "token": "admin_token",
-        "role": "admin"
+        "token": issue_admin_token(judge_id),
+        "role": "admin",
+        "judgeId": judge_id
     }
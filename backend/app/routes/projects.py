@@ -1,8 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from app.models import Project, ProjectCreate, ProjectUpdate
+from app.models import Project, ProjectCreate, ProjectUpdate, UploadComplete
+from app.config import settings
 from app.dependencies import get_current_user
 from app.services.firebase import get_db
-from app.services.storage import upload_pdf, delete_pdf
+from app.services.storage import upload_pdf, create_upload_url, get_pdf_info, publish_pdf
+from app.services.blob_gc import schedule_blob_deletion
+from app.services.pdf_pipeline import pdf_pipeline, STATUS_QUEUED, TEXT_COLLECTION
+from app.services.duplicates import get_duplicate_index
+from app.services.leaderboard import get_leaderboard
+from app.services.scoring import get_score_engine
 from typing import List, Optional
 import uuid
 from datetime import datetime
@@ -52,6 +58,7 @@ async def create_project(
     
     doc_ref = db.collection('projects').document()
     doc_ref.set(project_data)
+    get_duplicate_index().upsert(doc_ref.id, project_data)
     
     project_data['id'] = doc_ref.id
     return Project(**project_data)
@@ -83,9 +90,44 @@ async def update_project(
     updated_doc = doc_ref.get()
     result = updated_doc.to_dict()
     result['id'] = project_id
+    get_leaderboard().update(project_id, result)
+    get_duplicate_index().upsert(project_id, result)
     
     return Project(**result)
 
+def _check_pipeline_capacity():
+    """Reject early rather than store a file we cannot process soon"""
+    if pdf_pipeline.is_full():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="PDF processing is busy, please retry shortly",
+            headers={"Retry-After": "5"}
+        )
+
+def _attach_pdf(project_id: str, doc_ref, existing_data: dict, blob_name: str, url: str, slot: dict):
+    """Point a project at a newly stored PDF and queue it for processing"""
+    # Read before the update, which may change existing_data in place
+    old_blob = existing_data.get('promptPdfName')
+    
+    # Update project; page count, hash and text are filled in by the pipeline
+    doc_ref.update({
+        'promptPdfName': blob_name,
+        'promptPdfUrl': url,
+        'promptPdfStatus': STATUS_QUEUED,
+        'promptPdfPages': None,
+        'promptPdfHash': None,
+        'promptPdfTextIndexed': None,
+        'promptPdfError': None
+    })
+    
+    # Old PDF is removed from storage in the background, only once the
+    # project no longer references it
+    if old_blob and old_blob != blob_name:
+        schedule_blob_deletion(old_blob)
+    
+    # The reserved slot guarantees room in the queue
+    pdf_pipeline.submit(project_id, blob_name, slot)
+
 @router.post("/{project_id}/upload-pdf")
 async def upload_project_pdf(
     project_id: str,
@@ -110,24 +152,87 @@ async def upload_project_pdf(
     if existing_data['teamId'] != user['teamId']:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    # Delete old PDF if exists
-    if existing_data.get('promptPdfName'):
-        delete_pdf(existing_data.get('promptPdfName'))
-    
-    # Upload new PDF
-    content = await file.read()
-    blob_name, url = upload_pdf(content, file.filename, user['teamId'])
-    
-    # Update project
-    doc_ref.update({
-        'promptPdfName': blob_name,
-        'promptPdfUrl': url
-    })
+    # Hold a queue slot across the awaits below so the upload cannot be
+    # accepted without room to process it
+    _check_pipeline_capacity()
+    with pdf_pipeline.reserve() as slot:
+        # Upload new PDF
+        content = await file.read()
+        blob_name, url = upload_pdf(content, file.filename, user['teamId'])
+        _attach_pdf(project_id, doc_ref, existing_data, blob_name, url, slot)
     
     return {
         "filename": file.filename,
         "blobName": blob_name,
-        "url": url
+        "url": url,
+        "status": STATUS_QUEUED
+    }
+
+@router.post("/{project_id}/upload-url")
+async def create_project_upload_url(
+    project_id: str,
+    user: dict = Depends(get_current_user)
+):
+    """Get a signed URL to PUT a PDF directly to storage"""
+    db = get_db()
+    doc = db.collection('projects').document(project_id).get()
+    
+    if not doc.exists:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    if doc.to_dict()['teamId'] != user['teamId']:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    _check_pipeline_capacity()
+    
+    return create_upload_url(user['teamId'])
+
+@router.post("/{project_id}/upload-complete")
+async def complete_project_upload(
+    project_id: str,
+    upload: UploadComplete,
+    user: dict = Depends(get_current_user)
+):
+    """Record a PDF uploaded through a signed URL"""
+    db = get_db()
+    doc_ref = db.collection('projects').document(project_id)
+    doc = doc_ref.get()
+    
+    if not doc.exists:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    existing_data = doc.to_dict()
+    if existing_data['teamId'] != user['teamId']:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    # Only blobs issued to this team can be attached
+    if not upload.blobName.startswith(f"prompts/{user['teamId']}/") or '..' in upload.blobName:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    if upload.blobName == existing_data.get('promptPdfName'):
+        raise HTTPException(status_code=400, detail="PDF already attached")
+    
+    info = get_pdf_info(upload.blobName)
+    if info is None:
+        raise HTTPException(status_code=400, detail="Uploaded file not found")
+    
+    if info['contentType'] != 'application/pdf' or info['size'] > settings.PDF_MAX_BYTES:
+        schedule_blob_deletion(upload.blobName, reason="rejected")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only PDF files are allowed"
+        )
+    
+    _check_pipeline_capacity()
+    with pdf_pipeline.reserve() as slot:
+        url = publish_pdf(upload.blobName)
+        _attach_pdf(project_id, doc_ref, existing_data, upload.blobName, url, slot)
+    
+    return {
+        "filename": upload.filename,
+        "blobName": upload.blobName,
+        "url": url,
+        "status": STATUS_QUEUED
     }
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -147,9 +252,15 @@ async def delete_project(
     if existing_data['teamId'] != user['teamId']:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    # Delete PDF if exists
-    if existing_data.get('promptPdfName'):
-        delete_pdf(existing_data.get('promptPdfName'))
-    
+    old_blob = existing_data.get('promptPdfName')
     doc_ref.delete()
+    
+    # PDF is removed from storage in the background once the project is gone
+    if old_blob:
+        schedule_blob_deletion(old_blob, reason="project deleted")
+    
+    db.collection(TEXT_COLLECTION).document(project_id).delete()
+    get_score_engine().remove_project(project_id)
+    get_leaderboard().remove(project_id)
+    get_duplicate_index().remove(project_id)
     return None
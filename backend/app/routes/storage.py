@@ -0,0 +1,43 @@
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from app.config import settings
+from app.services.storage import mock_storage, mock_storage_created, verify_mock_upload_signature, GCS_AVAILABLE
+import time
+
+router = APIRouter()
+
+@router.put("/{blob_name:path}", status_code=status.HTTP_200_OK)
+async def put_mock_blob(
+    blob_name: str,
+    request: Request,
+    expires: int = Query(...),
+    signature: str = Query(...)
+):
+    """Accept a signed direct upload (mock storage only)"""
+    if GCS_AVAILABLE and not settings.USE_MOCK_DB:
+        raise HTTPException(status_code=404, detail="Not found")
+    
+    if not verify_mock_upload_signature(blob_name, expires, signature):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid or expired upload URL"
+        )
+    
+    if request.headers.get('content-type') != 'application/pdf':
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only PDF files are allowed"
+        )
+    
+    content = bytearray()
+    async for chunk in request.stream():
+        content.extend(chunk)
+        if len(content) > settings.PDF_MAX_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="File too large"
+            )
+    
+    mock_storage[blob_name] = bytes(content)
+    mock_storage_created[blob_name] = time.time()
+    print(f"📁 Mock PDF uploaded: {blob_name}")
+    return {"blobName": blob_name, "size": len(content)}
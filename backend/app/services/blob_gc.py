@@ -0,0 +1,109 @@
+from app.config import settings
+from app.services.firebase import get_db
+from app.services.storage import delete_pdfs, list_pdfs
+from datetime import datetime
+import asyncio
+import hashlib
+import time
+
+# Blobs waiting to be deleted, one document per blob
+TOMBSTONE_COLLECTION = "blob_tombstones"
+
+
+def _tombstone_id(blob_name: str) -> str:
+    # Blob names contain "/", which Firestore document ids cannot
+    return hashlib.sha1(blob_name.encode()).hexdigest()
+
+
+def schedule_blob_deletion(blob_name: str, reason: str = "replaced"):
+    """Record a blob for deletion by the background sweeper"""
+    if not blob_name:
+        return
+    get_db().collection(TOMBSTONE_COLLECTION).document(_tombstone_id(blob_name)).set({
+        "blobName": blob_name,
+        "reason": reason,
+        "createdAt": datetime.utcnow().isoformat(),
+        "attempts": 0,
+        "lastError": None
+    })
+
+
+class BlobCollector:
+    """Deletes tombstoned blobs in batches and reconciles orphans"""
+
+    def __init__(self):
+        self._tasks = []
+        self.last_sweep = None
+        self.last_reconcile = None
+
+    async def start(self):
+        self._tasks = [
+            asyncio.create_task(self._loop(self.sweep, settings.BLOB_GC_INTERVAL_SECONDS)),
+            asyncio.create_task(self._loop(self.reconcile, settings.BLOB_RECONCILE_INTERVAL_SECONDS)),
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _loop(self, job, interval):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(job)
+            except Exception as e:
+                print(f"⚠️  Blob cleanup failed: {e}")
+
+    def sweep(self) -> dict:
+        """Delete one batch of tombstoned blobs"""
+        collection = get_db().collection(TOMBSTONE_COLLECTION)
+        # Tombstones that ran out of attempts stay behind as a record
+        query = collection.where('attempts', '<', settings.BLOB_GC_MAX_ATTEMPTS)
+        tombstones = [
+            (doc.id, doc.to_dict())
+            for doc in query.limit(settings.BLOB_GC_BATCH_SIZE).stream()
+        ]
+        if not tombstones:
+            return {"deleted": 0, "failed": 0}
+
+        failures = delete_pdfs([data['blobName'] for _, data in tombstones])
+        for doc_id, data in tombstones:
+            doc_ref = collection.document(doc_id)
+            error = failures.get(data['blobName'])
+            if error is None:
+                doc_ref.delete()
+            else:
+                attempts = data.get('attempts', 0) + 1
+                doc_ref.update({'attempts': attempts, 'lastError': error})
+                print(f"⚠️  Could not delete {data['blobName']} (attempt {attempts}): {error}")
+
+        self.last_sweep = datetime.utcnow().isoformat()
+        return {"deleted": len(tombstones) - len(failures), "failed": len(failures)}
+
+    def reconcile(self) -> dict:
+        """Tombstone stored PDFs that no project (or tombstone) references"""
+        db = get_db()
+        referenced = {
+            doc.to_dict().get('promptPdfName') for doc in db.collection('projects').stream()
+        }
+        referenced |= {
+            doc.to_dict().get('blobName') for doc in db.collection(TOMBSTONE_COLLECTION).stream()
+        }
+        # Skip recent blobs: signed-URL uploads exist before upload-complete
+        cutoff = time.time() - settings.BLOB_ORPHAN_GRACE_SECONDS
+        orphans = [
+            blob_name for blob_name, created in list_pdfs("prompts/")
+            if blob_name not in referenced and created < cutoff
+        ]
+        for blob_name in orphans:
+            schedule_blob_deletion(blob_name, reason="orphaned")
+        if orphans:
+            print(f"🧹 Found {len(orphans)} orphaned PDFs")
+
+        self.last_reconcile = datetime.utcnow().isoformat()
+        return {"orphans": len(orphans)}
+
+
+blob_collector = BlobCollector()
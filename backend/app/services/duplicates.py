@@ -0,0 +1,208 @@
+import numpy as np
+import re
+import threading
+import zlib
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+from app.config import settings
+from app.services.firebase import get_project_documents
+
+# MinHash signature length, split into LSH bands of equal size
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+# Shorter texts are too generic to fingerprint ("Login page", "Dark mode")
+MIN_WORDS = 8
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20240101)
+_PERM_A = _rng.integers(1, _PRIME, NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, _PRIME, NUM_PERM, dtype=np.uint64)
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Text fields fingerprinted for near-duplicate detection
+TEXT_FIELDS = ("description", "features")
+
+
+def normalize_github_url(url):
+    """Canonical `host/owner/repo` form of a repository URL"""
+    if not url:
+        return None
+    url = str(url).strip().lower()
+    if "://" not in url:
+        url = "https://" + url
+    parts = urlsplit(url)
+    host = parts.netloc.rsplit("@", 1)[-1]
+    if host.startswith("www."):
+        host = host[4:]
+    path = re.sub(r"/+", "/", parts.path).strip("/")
+    if path.endswith(".git"):
+        path = path[:-4]
+    path = path.rstrip("/")
+    if not host or not path:
+        return None
+    return f"{host}/{path}"
+
+
+def project_texts(data):
+    """Text of each fingerprinted field of a project document"""
+    features = " ".join(f.get("text", "") for f in data.get("features") or [])
+    return {
+        "description": data.get("description") or "",
+        "features": features,
+    }
+
+
+def minhash(text):
+    """MinHash signature of a text's word shingles, or None if it is too short"""
+    words = _WORD_PATTERN.findall(text.lower())
+    if len(words) < MIN_WORDS:
+        return None
+    shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    hashes = np.fromiter(
+        (zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles)
+    )
+    return ((np.outer(hashes, _PERM_A) + _PERM_B) % _PRIME).min(axis=0)
+
+
+def _bands(signature):
+    return [
+        (band, signature[band * ROWS:(band + 1) * ROWS].tobytes())
+        for band in range(BANDS)
+    ]
+
+
+class DuplicateIndex:
+    """Index of projects by normalized GitHub URL and MinHash LSH buckets.
+
+    Each upsert looks up only the projects sharing a URL or an LSH bucket,
+    so finding duplicates never compares every pair of projects.
+    """
+
+    def __init__(self, threshold=0.6):
+        self._lock = threading.RLock()
+        self.threshold = threshold
+        self._projects = {}
+        self._by_url = defaultdict(set)
+        self._buckets = {field: defaultdict(set) for field in TEXT_FIELDS}
+        # project id -> {other project id -> {reason: similarity}}
+        self._matches = defaultdict(dict)
+
+    def upsert(self, project_id, data):
+        with self._lock:
+            self.remove(project_id)
+            entry = {
+                "url": normalize_github_url(data.get("githubUrl")),
+                "signatures": {},
+                "teamId": data.get("teamId"),
+                "teamName": data.get("teamName", ""),
+                "name": data.get("name", ""),
+                "githubUrl": data.get("githubUrl"),
+            }
+            self._projects[project_id] = entry
+
+            if entry["url"]:
+                for other in self._by_url[entry["url"]]:
+                    self._link(project_id, other, "githubUrl", 1.0)
+                self._by_url[entry["url"]].add(project_id)
+
+            for field, text in project_texts(data).items():
+                signature = minhash(text)
+                if signature is None:
+                    continue
+                entry["signatures"][field] = signature
+                buckets = self._buckets[field]
+                candidates = set()
+                for key in _bands(signature):
+                    candidates |= buckets[key]
+                    buckets[key].add(project_id)
+                for other in candidates:
+                    other_signature = self._projects[other]["signatures"][field]
+                    similarity = float(np.mean(signature == other_signature))
+                    if similarity >= self.threshold:
+                        self._link(project_id, other, field, similarity)
+
+    def remove(self, project_id):
+        with self._lock:
+            entry = self._projects.pop(project_id, None)
+            if entry is None:
+                return
+            if entry["url"]:
+                self._by_url[entry["url"]].discard(project_id)
+                if not self._by_url[entry["url"]]:
+                    del self._by_url[entry["url"]]
+            for field, signature in entry["signatures"].items():
+                buckets = self._buckets[field]
+                for key in _bands(signature):
+                    buckets[key].discard(project_id)
+                    if not buckets[key]:
+                        del buckets[key]
+            for other in self._matches.pop(project_id, {}):
+                self._matches[other].pop(project_id, None)
+                if not self._matches[other]:
+                    del self._matches[other]
+
+    def _link(self, a, b, reason, similarity):
+        self._matches[a].setdefault(b, {})[reason] = round(similarity, 4)
+        self._matches[b].setdefault(a, {})[reason] = round(similarity, 4)
+
+    def clusters(self):
+        """Groups of projects connected by at least one duplicate match"""
+        with self._lock:
+            seen = set()
+            clusters = []
+            for start in self._matches:
+                if start in seen:
+                    continue
+                members = []
+                stack = [start]
+                seen.add(start)
+                while stack:
+                    project_id = stack.pop()
+                    members.append(project_id)
+                    for other in self._matches[project_id]:
+                        if other not in seen:
+                            seen.add(other)
+                            stack.append(other)
+                members.sort()
+                matches = [
+                    {"projectIds": [a, b], "reasons": self._matches[a][b]}
+                    for a in members for b in self._matches[a] if a < b
+                ]
+                clusters.append({
+                    "projects": [
+                        {
+                            "id": project_id,
+                            "teamId": self._projects[project_id]["teamId"],
+                            "teamName": self._projects[project_id]["teamName"],
+                            "name": self._projects[project_id]["name"],
+                            "githubUrl": self._projects[project_id]["githubUrl"],
+                        }
+                        for project_id in members
+                    ],
+                    "matches": matches,
+                })
+            clusters.sort(key=lambda c: len(c["projects"]), reverse=True)
+            return clusters
+
+
+_index = None
+
+
+def load_duplicate_index(project_docs):
+    """Build the duplicate index from (id, data) project pairs"""
+    global _index
+    index = DuplicateIndex(settings.DUPLICATE_SIMILARITY)
+    for project_id, data in project_docs:
+        index.upsert(project_id, data)
+    _index = index
+    return index
+
+
+def get_duplicate_index():
+    if _index is None:
+        load_duplicate_index(get_project_documents())
+    return _index
@@ -36,8 +36,20 @@ class MockCollection:
     def where(self, field, op, value):
         return MockQuery(self.data, field, op, value)
     
+    def limit(self, count):
+        return MockLimit(self.data, count)
+    
     def stream(self):
-        for doc_id, doc_data in self.data.items():
+        for doc_id, doc_data in list(self.data.items()):
+            yield MockDocumentSnapshot(doc_id, doc_data)
+
+class MockLimit:
+    def __init__(self, data, count):
+        self.data = data
+        self.count = count
+    
+    def stream(self):
+        for doc_id, doc_data in list(self.data.items())[:self.count]:
             yield MockDocumentSnapshot(doc_id, doc_data)
 
 class MockQuery:
@@ -46,20 +58,30 @@ class MockQuery:
         self.field = field
         self.op = op
         self.value = value
+        self.count = None
     
     def limit(self, count):
+        self.count = count
         return self
     
+    def _matches(self, doc_data):
+        field_value = doc_data.get(self.field)
+        if self.op == '==':
+            return field_value == self.value
+        if self.op == '<':
+            return field_value is not None and field_value < self.value
+        return False
+    
     def get(self):
-        results = []
-        for doc_id, doc_data in self.data.items():
-            if self.op == '==' and doc_data.get(self.field) == self.value:
-                results.append(MockDocumentSnapshot(doc_id, doc_data))
-        return results
+        return list(self.stream())
     
     def stream(self):
-        for doc_id, doc_data in self.data.items():
-            if self.op == '==' and doc_data.get(self.field) == self.value:
+        found = 0
+        for doc_id, doc_data in list(self.data.items()):
+            if self.count is not None and found >= self.count:
+                return
+            if self._matches(doc_data):
+                found += 1
                 yield MockDocumentSnapshot(doc_id, doc_data)
 
 class MockDocument:
@@ -75,7 +97,16 @@ class MockDocument:
     
     def update(self, data):
         if self.id in self.collection_data:
-            self.collection_data[self.id].update(data)
+            doc = self.collection_data[self.id]
+            for key, value in data.items():
+                # Dotted keys update one nested field, as in Firestore
+                *parents, field = key.split('.')
+                target = doc
+                for parent in parents:
+                    if not isinstance(target.get(parent), dict):
+                        target[parent] = {}
+                    target = target[parent]
+                target[field] = value
     
     def delete(self):
         if self.id in self.collection_data:
@@ -117,6 +148,10 @@ def get_db():
         db = initialize_firebase()
     return db
 
+def get_project_documents():
+    """Read every project once as a list of (id, data) pairs"""
+    return [(doc.id, doc.to_dict()) for doc in get_db().collection('projects').stream()]
+
 def verify_firebase_token(token: str):
     """Verify Firebase ID token"""
     if not FIREBASE_AVAILABLE:
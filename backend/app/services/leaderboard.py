@@ -0,0 +1,93 @@
+from sortedcontainers import SortedList
+import threading
+
+from app.services.firebase import get_project_documents
+
+
+class Leaderboard:
+    """Scored projects kept in rank order.
+
+    Entries are ordered by totalScore (highest first), then by submission
+    time (earliest first) and finally by project id, so ranks are stable.
+    Updates, removals and rank lookups are O(log N).
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._order = SortedList()
+        self._keys = {}
+        self._entries = {}
+
+    @staticmethod
+    def _sort_key(project_id, data):
+        return (-float(data['totalScore']), data.get('submittedAt') or '', project_id)
+
+    def update(self, project_id, data):
+        """Insert or reposition a project from its stored document"""
+        with self._lock:
+            self.remove(project_id)
+            if data.get('totalScore') is None:
+                return
+            key = self._sort_key(project_id, data)
+            self._order.add(key)
+            self._keys[project_id] = key
+            self._entries[project_id] = {
+                "projectId": project_id,
+                "teamId": data.get('teamId'),
+                "teamName": data.get('teamName', ''),
+                "name": data.get('name', ''),
+                "totalScore": data['totalScore'],
+            }
+
+    def remove(self, project_id):
+        with self._lock:
+            key = self._keys.pop(project_id, None)
+            if key is not None:
+                self._order.remove(key)
+                del self._entries[project_id]
+
+    def __len__(self):
+        return len(self._order)
+
+    def page(self, limit, offset=0):
+        """Entries ranked offset+1 .. offset+limit"""
+        with self._lock:
+            keys = self._order.islice(offset, offset + limit)
+            return [
+                {**self._entries[key[2]], "rank": rank}
+                for rank, key in enumerate(keys, start=offset + 1)
+            ]
+
+    def rank_of(self, project_id):
+        """1-based rank of a project, or None if it is not scored"""
+        with self._lock:
+            key = self._keys.get(project_id)
+            if key is None:
+                return None
+            return self._order.index(key) + 1
+
+    def entry(self, project_id):
+        with self._lock:
+            rank = self.rank_of(project_id)
+            if rank is None:
+                return None
+            return {**self._entries[project_id], "rank": rank}
+
+
+_leaderboard = None
+
+
+def load_leaderboard(project_docs):
+    """Build the leaderboard from (id, data) project pairs"""
+    global _leaderboard
+    leaderboard = Leaderboard()
+    for project_id, data in project_docs:
+        leaderboard.update(project_id, data)
+    _leaderboard = leaderboard
+    return leaderboard
+
+
+def get_leaderboard():
+    if _leaderboard is None:
+        load_leaderboard(get_project_documents())
+    return _leaderboard
@@ -0,0 +1,275 @@
+try:
+    from pypdf import PdfReader
+    from pypdf.errors import PdfReadError
+    PYPDF_AVAILABLE = True
+except ImportError:
+    PYPDF_AVAILABLE = False
+    print("⚠️  pypdf not installed. PDFs will only get basic validation.")
+
+from app.config import settings
+from app.services.firebase import get_db, get_project_documents
+from app.services.storage import download_pdf
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+import asyncio
+import hashlib
+import io
+import re
+
+# Values of the `promptPdfStatus` project field
+STATUS_QUEUED = "queued"
+STATUS_PROCESSING = "processing"
+STATUS_READY = "ready"
+STATUS_INVALID = "invalid"
+STATUS_FAILED = "failed"
+
+# Extracted text lives outside the project document to keep it small
+TEXT_COLLECTION = "pdf_texts"
+
+_PAGE_PATTERN = re.compile(rb"/Type\s*/Page(?![a-zA-Z])")
+
+
+class InvalidPdfError(Exception):
+    """The uploaded file is not a readable PDF"""
+
+
+class PipelineBusyError(Exception):
+    """The processing queue is full"""
+
+
+def analyze_pdf(content: bytes, max_text_chars: int) -> dict:
+    """Validate a PDF and extract its metadata (runs in a worker process)"""
+    if content.lstrip()[:5] != b"%PDF-" or b"%%EOF" not in content[-1024:]:
+        raise InvalidPdfError("Missing PDF header or end-of-file marker")
+
+    result = {
+        "hash": hashlib.sha256(content).hexdigest(),
+        "pages": None,
+        "text": None,
+    }
+
+    if not PYPDF_AVAILABLE:
+        result["pages"] = len(_PAGE_PATTERN.findall(content))
+        return result
+
+    try:
+        reader = PdfReader(io.BytesIO(content))
+        if reader.is_encrypted:
+            reader.decrypt("")
+        result["pages"] = len(reader.pages)
+        chunks = []
+        length = 0
+        for page in reader.pages:
+            if length >= max_text_chars:
+                break
+            text = page.extract_text() or ""
+            chunks.append(text)
+            length += len(text)
+        result["text"] = "\n".join(chunks).strip()[:max_text_chars]
+    except (PdfReadError, ValueError, KeyError) as e:
+        raise InvalidPdfError(str(e))
+
+    return result
+
+
+def pending_jobs(project_docs):
+    """(project id, blob name) for PDFs still queued or in flight"""
+    return [
+        (project_id, data['promptPdfName'])
+        for project_id, data in project_docs
+        if data.get('promptPdfName') and data.get('promptPdfStatus') in (STATUS_QUEUED, STATUS_PROCESSING)
+    ]
+
+
+class PdfPipeline:
+    """Bounded queue of uploaded PDFs, parsed on a process pool"""
+
+    def __init__(self):
+        self._queue = None
+        self._executor = None
+        self._workers = []
+        self._reserved = 0
+        self._backlog = deque()
+
+    @property
+    def running(self) -> bool:
+        return self._queue is not None
+
+    def is_full(self) -> bool:
+        return self.running and self._queue.qsize() + self._reserved >= self._queue.maxsize
+
+    @contextmanager
+    def reserve(self):
+        """Hold a queue slot while an upload is in progress.
+
+        Raises PipelineBusyError if no slot is free. Passing the yielded
+        slot to ``submit(project_id, blob_name, slot)`` uses it; otherwise
+        it is released on exit. A request that awaits between the check and
+        the submit therefore cannot lose its place to another request.
+        """
+        if self.is_full():
+            raise PipelineBusyError("PDF processing queue is full")
+        held = self.running
+        if held:
+            self._reserved += 1
+        slot = {"held": held}
+        try:
+            yield slot
+        finally:
+            if slot["held"]:
+                self._reserved -= 1
+
+    async def start(self, pending=None):
+        """Start the workers; `pending` is pending_jobs() output if already known"""
+        if pending is None:
+            pending = pending_jobs(await asyncio.to_thread(get_project_documents))
+        self._queue = asyncio.Queue(maxsize=settings.PDF_QUEUE_SIZE)
+        self._backlog = deque()
+        self._executor = ProcessPoolExecutor(max_workers=settings.PDF_WORKERS)
+        self._requeue(pending)
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(settings.PDF_WORKERS)
+        ]
+
+    async def stop(self):
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+        self._queue = None
+        self._backlog.clear()  # Still queued in the store for the next start
+
+    def submit(self, project_id: str, blob_name: str, slot: dict = None):
+        """Queue a PDF for processing without waiting, using a reserved slot if given"""
+        if not self.running:
+            # Picked up by pending_jobs() on the next start
+            return
+        if slot is not None and slot["held"]:
+            slot["held"] = False
+            self._reserved -= 1
+        elif self.is_full():
+            raise PipelineBusyError("PDF processing queue is full")
+        self._queue.put_nowait((project_id, blob_name))
+
+    def _requeue(self, pending):
+        """Resume PDFs that were queued or in flight when the server stopped.
+
+        Jobs that do not fit in the queue wait in a backlog. Workers take
+        from it whenever the queue is empty, so resumed jobs never use a
+        slot that an upload has reserved.
+        """
+        for job in pending:
+            if self._queue.full():
+                self._backlog.append(job)
+            else:
+                self._queue.put_nowait(job)
+
+    async def _next_job(self):
+        """Next (project id, blob name), and whether it came from the queue"""
+        if self._queue.empty() and self._backlog:
+            return self._backlog.popleft(), False
+        return await self._queue.get(), True
+
+    async def _worker(self):
+        while True:
+            (project_id, blob_name), from_queue = await self._next_job()
+            try:
+                await self._process(project_id, blob_name)
+            except Exception as e:
+                print(f"⚠️  PDF processing crashed for {blob_name}: {e}")
+            finally:
+                if from_queue:
+                    self._queue.task_done()
+
+    async def _process(self, project_id: str, blob_name: str):
+        if not await asyncio.to_thread(self._set_status, project_id, blob_name, {
+            'promptPdfStatus': STATUS_PROCESSING
+        }):
+            return
+
+        loop = asyncio.get_running_loop()
+        last_error = None
+        for attempt in range(settings.PDF_MAX_RETRIES + 1):
+            if attempt:
+                await asyncio.sleep(settings.PDF_RETRY_BASE_DELAY * 2 ** (attempt - 1))
+            try:
+                content = await asyncio.to_thread(download_pdf, blob_name)
+                result = await asyncio.wait_for(
+                    loop.run_in_executor(
+                        self._executor, analyze_pdf, content, settings.PDF_TEXT_MAX_CHARS
+                    ),
+                    settings.PDF_PARSE_TIMEOUT_SECONDS
+                )
+            except InvalidPdfError as e:
+                await asyncio.to_thread(self._set_status, project_id, blob_name, {
+                    'promptPdfStatus': STATUS_INVALID,
+                    'promptPdfError': str(e) or "Invalid PDF"
+                })
+                print(f"⚠️  Invalid PDF {blob_name}: {e}")
+                return
+            except asyncio.TimeoutError:
+                last_error = TimeoutError(
+                    f"Parsing took longer than {settings.PDF_PARSE_TIMEOUT_SECONDS:g}s"
+                )
+                # The parse keeps its process busy until the pool is torn down
+                self._replace_executor(terminate=True)
+                continue
+            except BrokenProcessPool as e:
+                last_error = e
+                self._replace_executor()
+                continue
+            except Exception as e:
+                last_error = e
+                continue
+
+            await asyncio.to_thread(self._store_result, project_id, blob_name, result)
+            print(f"📄 PDF processed: {blob_name} ({result['pages']} pages)")
+            return
+
+        await asyncio.to_thread(self._set_status, project_id, blob_name, {
+            'promptPdfStatus': STATUS_FAILED,
+            'promptPdfError': str(last_error) or type(last_error).__name__
+        })
+        print(f"⚠️  PDF processing failed for {blob_name}: {last_error}")
+
+    def _replace_executor(self, terminate=False):
+        """Swap in a fresh process pool, killing the old one's processes if asked"""
+        old = self._executor
+        self._executor = ProcessPoolExecutor(max_workers=settings.PDF_WORKERS)
+        if terminate:
+            # Parses running on other workers fail with BrokenProcessPool and retry
+            for process in list((old._processes or {}).values()):
+                process.terminate()
+        old.shutdown(wait=False, cancel_futures=True)
+
+    def _set_status(self, project_id: str, blob_name: str, fields: dict) -> bool:
+        """Update the project unless its PDF was replaced meanwhile"""
+        doc_ref = get_db().collection('projects').document(project_id)
+        doc = doc_ref.get()
+        if not doc.exists or doc.to_dict().get('promptPdfName') != blob_name:
+            return False
+        doc_ref.update(fields)
+        return True
+
+    def _store_result(self, project_id: str, blob_name: str, result: dict):
+        text = result["text"]
+        if not self._set_status(project_id, blob_name, {
+            'promptPdfStatus': STATUS_READY,
+            'promptPdfPages': result["pages"],
+            'promptPdfHash': result["hash"],
+            'promptPdfTextIndexed': bool(text),
+            'promptPdfError': None
+        }):
+            return
+        text_ref = get_db().collection(TEXT_COLLECTION).document(project_id)
+        if text:
+            text_ref.set({"blobName": blob_name, "text": text})
+        else:
+            text_ref.delete()
+
+
+pdf_pipeline = PdfPipeline()
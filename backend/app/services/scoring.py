@@ -0,0 +1,274 @@
+import numpy as np
+import threading
+import warnings
+
+from app.config import settings
+from app.services.firebase import get_project_documents
+
+# Scoring criteria, in the column order used by the score matrix
+CRITERIA = ("innovation", "feasibility", "uiUx", "promptEfficiency")
+
+# Judge id used for scores saved before per-judge scoring existed
+LEGACY_JUDGE_ID = "admin"
+
+_INITIAL_PROJECTS = 64
+_INITIAL_JUDGES = 4
+
+
+class ScoreEngine:
+    """Project x judge x criterion score matrix with cached aggregates.
+
+    Missing scores are stored as NaN. Per-judge running moments are kept up
+    to date on every write, so changing one judge's score only touches that
+    judge's statistics and one project row; the normalized view is rebuilt
+    lazily with a single vectorized pass when it is next read.
+    """
+
+    def __init__(self, weights=None):
+        self._lock = threading.RLock()
+        self._weights = np.array(
+            [(weights or {}).get(c, 1.0) for c in CRITERIA], dtype=float
+        )
+        n = len(CRITERIA)
+        self._values = np.full((_INITIAL_PROJECTS, _INITIAL_JUDGES, n), np.nan)
+        self._project_index = {}
+        self._project_ids = []
+        self._judge_index = {}
+        self._judge_ids = []
+        # Running per-judge moments: count, sum and sum of squares per criterion
+        self._judge_count = np.zeros((_INITIAL_JUDGES, n))
+        self._judge_sum = np.zeros((_INITIAL_JUDGES, n))
+        self._judge_sumsq = np.zeros((_INITIAL_JUDGES, n))
+        # Cached raw aggregates per project row
+        self._mean = np.full((_INITIAL_PROJECTS, n), np.nan)
+        self._median = np.full((_INITIAL_PROJECTS, n), np.nan)
+        self._std = np.full((_INITIAL_PROJECTS, n), np.nan)
+        self._judges_scored = np.zeros(_INITIAL_PROJECTS, dtype=int)
+        self._normalized_total = None
+
+    # ---------------------------------------------------------------- storage
+
+    def _project_row(self, project_id, create=True):
+        row = self._project_index.get(project_id)
+        if row is not None or not create:
+            return row
+        row = len(self._project_ids)
+        if row >= self._values.shape[0]:
+            self._grow_projects()
+        self._project_index[project_id] = row
+        self._project_ids.append(project_id)
+        return row
+
+    def _judge_col(self, judge_id):
+        col = self._judge_index.get(judge_id)
+        if col is not None:
+            return col
+        col = len(self._judge_ids)
+        if col >= self._values.shape[1]:
+            self._grow_judges()
+        self._judge_index[judge_id] = col
+        self._judge_ids.append(judge_id)
+        return col
+
+    def _grow_projects(self):
+        cap = self._values.shape[0] * 2
+        n = len(CRITERIA)
+        values = np.full((cap, self._values.shape[1], n), np.nan)
+        values[: self._values.shape[0]] = self._values
+        self._values = values
+        for name in ("_mean", "_median", "_std"):
+            old = getattr(self, name)
+            new = np.full((cap, n), np.nan)
+            new[: old.shape[0]] = old
+            setattr(self, name, new)
+        judges_scored = np.zeros(cap, dtype=int)
+        judges_scored[: self._judges_scored.shape[0]] = self._judges_scored
+        self._judges_scored = judges_scored
+
+    def _grow_judges(self):
+        cap = self._values.shape[1] * 2
+        n = len(CRITERIA)
+        values = np.full((self._values.shape[0], cap, n), np.nan)
+        values[:, : self._values.shape[1]] = self._values
+        self._values = values
+        for name in ("_judge_count", "_judge_sum", "_judge_sumsq"):
+            old = getattr(self, name)
+            new = np.zeros((cap, n))
+            new[: old.shape[0]] = old
+            setattr(self, name, new)
+
+    def _apply_moments(self, col, cell, sign):
+        present = ~np.isnan(cell)
+        filled = np.where(present, cell, 0.0)
+        self._judge_count[col] += sign * present
+        self._judge_sum[col] += sign * filled
+        self._judge_sumsq[col] += sign * filled * filled
+
+    def _refresh_row(self, row):
+        scores = self._values[row, : len(self._judge_ids)]
+        scored = ~np.all(np.isnan(scores), axis=1)
+        self._judges_scored[row] = int(scored.sum())
+        if not scored.any():
+            self._mean[row] = self._median[row] = self._std[row] = np.nan
+            return
+        scores = scores[scored]
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            self._mean[row] = np.nanmean(scores, axis=0)
+            self._median[row] = np.nanmedian(scores, axis=0)
+            self._std[row] = np.nanstd(scores, axis=0)
+
+    # ---------------------------------------------------------------- updates
+
+    def set_scores(self, project_id, judge_id, scores):
+        """Store one judge's scores for a project (None clears them)"""
+        with self._lock:
+            row = self._project_row(project_id)
+            col = self._judge_col(judge_id)
+            new = np.array(
+                [np.nan if not scores or scores.get(c) is None else float(scores[c]) for c in CRITERIA]
+            )
+            self._apply_moments(col, self._values[row, col], -1)
+            self._apply_moments(col, new, 1)
+            self._values[row, col] = new
+            self._refresh_row(row)
+            self._normalized_total = None
+
+    def load_project(self, project_id, judge_scores):
+        """Replace every judge's scores for a project"""
+        with self._lock:
+            self.remove_project(project_id)
+            for judge_id, scores in (judge_scores or {}).items():
+                self.set_scores(project_id, judge_id, scores)
+
+    def remove_project(self, project_id):
+        """Drop a project's row; its slot is cleared and left unused"""
+        with self._lock:
+            row = self._project_index.get(project_id)
+            if row is None:
+                return
+            for col in range(len(self._judge_ids)):
+                self._apply_moments(col, self._values[row, col], -1)
+            self._values[row] = np.nan
+            self._refresh_row(row)
+            self._normalized_total = None
+
+    # ---------------------------------------------------------------- reads
+
+    def _weighted_total(self, per_criterion):
+        present = ~np.isnan(per_criterion)
+        totals = np.where(present, per_criterion, 0.0) @ self._weights
+        return np.where(present.any(axis=-1), totals, np.nan)
+
+    def _compute_normalized(self):
+        p, j = len(self._project_ids), len(self._judge_ids)
+        values = self._values[:p, :j]
+        count = self._judge_count[:j]
+        with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+            warnings.simplefilter("ignore", RuntimeWarning)
+            judge_mean = self._judge_sum[:j] / count
+            judge_std = np.sqrt(np.maximum(self._judge_sumsq[:j] / count - judge_mean ** 2, 0.0))
+            # Map each judge's z-scores back onto the pooled scale so that
+            # normalized totals stay comparable to raw points
+            total_count = count.sum(axis=0)
+            pooled_mean = self._judge_sum[:j].sum(axis=0) / total_count
+            pooled_std = np.sqrt(np.maximum(
+                self._judge_sumsq[:j].sum(axis=0) / total_count - pooled_mean ** 2, 0.0
+            ))
+            z = (values - judge_mean) / judge_std
+            # A judge with a single score (or identical scores) has no spread
+            z = np.where(np.isfinite(z), z, np.where(np.isnan(values), np.nan, 0.0))
+            normalized = pooled_mean + z * pooled_std
+            per_criterion = np.nanmean(normalized, axis=1)
+        self._normalized_total = self._weighted_total(per_criterion)
+
+    def _summaries(self, rows):
+        """Build response dicts for many rows with one vectorized pass"""
+        if self._normalized_total is None:
+            self._compute_normalized()
+
+        def listify(arr):
+            arr = np.round(arr, 4)
+            return np.where(np.isnan(arr), None, arr).tolist()
+
+        mean, median, std = (listify(a[rows]) for a in (self._mean, self._median, self._std))
+        totals = listify(self._weighted_total(self._mean[rows]))
+        normalized = listify(self._normalized_total[rows])
+        judges_scored = self._judges_scored[rows].tolist()
+        return [
+            {
+                "projectId": self._project_ids[row],
+                "judgesScored": judges_scored[i],
+                "mean": dict(zip(CRITERIA, mean[i])),
+                "median": dict(zip(CRITERIA, median[i])),
+                "std": dict(zip(CRITERIA, std[i])),
+                "totalScore": totals[i],
+                "normalizedScore": normalized[i],
+            }
+            for i, row in enumerate(rows.tolist())
+        ]
+
+    def project_summary(self, project_id):
+        """Aggregated scores for one project, or None if it has none"""
+        with self._lock:
+            row = self._project_index.get(project_id)
+            if row is None or self._judges_scored[row] == 0:
+                return None
+            return self._summaries(np.array([row]))[0]
+
+    def rankings(self, normalized=False, limit=None):
+        """Scored projects ordered by weighted total, best first"""
+        with self._lock:
+            p = len(self._project_ids)
+            if p == 0:
+                return []
+            if self._normalized_total is None:
+                self._compute_normalized()
+            totals = self._normalized_total if normalized else self._weighted_total(self._mean[:p])
+            rows = np.flatnonzero(self._judges_scored[:p] > 0)
+            order = rows[np.argsort(-totals[rows], kind="stable")]
+            if limit is not None:
+                order = order[:limit]
+            results = self._summaries(order)
+            for rank, summary in enumerate(results, start=1):
+                summary["rank"] = rank
+            return results
+
+
+def judge_scores_from_doc(data):
+    """Per-judge scores stored on a project document"""
+    judge_scores = data.get('judgeScores')
+    if judge_scores:
+        return judge_scores
+    # Projects scored before per-judge scoring keep a single `scores` map
+    if data.get('scores'):
+        return {LEGACY_JUDGE_ID: data['scores']}
+    return {}
+
+
+def aggregate_scores(judge_scores):
+    """Mean scores and weighted total for one project, on a scratch engine"""
+    engine = ScoreEngine(settings.SCORE_WEIGHTS_MAP)
+    engine.load_project("project", judge_scores)
+    return engine.project_summary("project")
+
+
+_engine = None
+
+
+def load_score_engine(project_docs):
+    """Build the score engine from (id, data) project pairs"""
+    global _engine
+    engine = ScoreEngine(settings.SCORE_WEIGHTS_MAP)
+    for project_id, data in project_docs:
+        judge_scores = judge_scores_from_doc(data)
+        if judge_scores:
+            engine.load_project(project_id, judge_scores)
+    _engine = engine
+    return engine
+
+
+def get_score_engine():
+    if _engine is None:
+        load_score_engine(get_project_documents())
+    return _engine
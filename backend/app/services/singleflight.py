@@ -0,0 +1,39 @@
+import asyncio
+
+
+class SingleFlight:
+    """Share one in-flight computation between concurrent identical calls.
+
+    The first caller for a key starts the computation; callers arriving
+    while it runs await the same task instead of starting their own.
+    The key is forgotten once the task finishes, so results are never
+    served stale after that.
+    """
+
+    def __init__(self):
+        self._inflight = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key, fn):
+        """Return fn()'s result, joining an identical call already running"""
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # Shielded so one caller disconnecting does not cancel the others
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "inFlight": len(self._inflight),
+        }
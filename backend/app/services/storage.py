@@ -1,5 +1,6 @@
 try:
     from google.cloud import storage
+    from google.api_core.exceptions import NotFound
     try:
         from google.oauth2 import service_account
         SERVICE_ACCOUNT_AVAILABLE = True
@@ -11,13 +12,19 @@ except ImportError:
     SERVICE_ACCOUNT_AVAILABLE = False
     print("⚠️  Google Cloud Storage not installed. Using mock storage.")
 
-from app.config import settings
+from app.config import settings, DEFAULT_UPLOAD_SIGNING_SECRET
+import hashlib
+import hmac
+import time
 import uuid
 from datetime import timedelta
+from urllib.parse import urlencode
 import os
 
 # Mock storage for local testing
 mock_storage = {}
+mock_storage_created = {}  # blob name -> upload timestamp
+MOCK_STORAGE_URL = "http://localhost:8000/mock-storage"
 
 def get_storage_client():
     if not GCS_AVAILABLE or settings.USE_MOCK_DB:
@@ -47,7 +54,8 @@ def upload_pdf(file_content: bytes, filename: str, team_id: str) -> tuple[str, s
     # Mock storage for local testing
     if not GCS_AVAILABLE or settings.USE_MOCK_DB:
         mock_storage[blob_name] = file_content
-        mock_url = f"http://localhost:8000/mock-storage/{blob_name}"
+        mock_storage_created[blob_name] = time.time()
+        mock_url = f"{MOCK_STORAGE_URL}/{blob_name}"
         print(f"📁 Mock PDF uploaded: {blob_name}")
         return blob_name, mock_url
     
@@ -69,18 +77,120 @@ def upload_pdf(file_content: bytes, filename: str, team_id: str) -> tuple[str, s
     
     return blob_name, public_url
 
-def delete_pdf(blob_name: str):
-    """Delete PDF from GCS"""
-    try:
-        if not GCS_AVAILABLE or settings.USE_MOCK_DB:
+def _mock_upload_signature(blob_name: str, expires: int) -> str:
+    settings.require_secret("UPLOAD_SIGNING_SECRET", DEFAULT_UPLOAD_SIGNING_SECRET)
+    message = f"PUT\n{blob_name}\n{expires}".encode()
+    return hmac.new(settings.UPLOAD_SIGNING_SECRET.encode(), message, hashlib.sha256).hexdigest()
+
+def verify_mock_upload_signature(blob_name: str, expires: int, signature: str) -> bool:
+    """Check a mock upload URL's signature and expiry"""
+    if expires < time.time():
+        return False
+    return hmac.compare_digest(_mock_upload_signature(blob_name, expires), signature)
+
+def create_upload_url(team_id: str) -> dict:
+    """Create a short-lived signed PUT URL for a new PDF blob"""
+    blob_name = f"prompts/{team_id}/{uuid.uuid4()}.pdf"
+    expires = int(time.time()) + settings.UPLOAD_URL_EXPIRY_SECONDS
+    headers = {"Content-Type": "application/pdf"}
+    
+    if not GCS_AVAILABLE or settings.USE_MOCK_DB:
+        query = urlencode({"expires": expires, "signature": _mock_upload_signature(blob_name, expires)})
+        url = f"{MOCK_STORAGE_URL}/{blob_name}?{query}"
+    else:
+        # GCS enforces the size limit through the signed content-length-range header
+        headers["x-goog-content-length-range"] = f"0,{settings.PDF_MAX_BYTES}"
+        client = get_storage_client()
+        blob = client.bucket(settings.GCS_BUCKET_NAME).blob(blob_name)
+        url = blob.generate_signed_url(
+            version="v4",
+            expiration=timedelta(seconds=settings.UPLOAD_URL_EXPIRY_SECONDS),
+            method="PUT",
+            content_type="application/pdf",
+            headers={"x-goog-content-length-range": headers["x-goog-content-length-range"]},
+        )
+    
+    return {
+        "blobName": blob_name,
+        "uploadUrl": url,
+        "method": "PUT",
+        "headers": headers,
+        "expiresAt": expires,
+    }
+
+def get_pdf_info(blob_name: str):
+    """Return {"size", "contentType"} for a stored blob, or None if missing"""
+    if not GCS_AVAILABLE or settings.USE_MOCK_DB:
+        if blob_name not in mock_storage:
+            return None
+        return {"size": len(mock_storage[blob_name]), "contentType": "application/pdf"}
+    
+    client = get_storage_client()
+    blob = client.bucket(settings.GCS_BUCKET_NAME).get_blob(blob_name)
+    if blob is None:
+        return None
+    return {"size": blob.size, "contentType": blob.content_type}
+
+def publish_pdf(blob_name: str) -> str:
+    """Make an uploaded blob publicly readable and return its URL"""
+    if not GCS_AVAILABLE or settings.USE_MOCK_DB:
+        return f"{MOCK_STORAGE_URL}/{blob_name}"
+    
+    client = get_storage_client()
+    blob = client.bucket(settings.GCS_BUCKET_NAME).blob(blob_name)
+    blob.make_public()
+    return blob.public_url
+
+def download_pdf(blob_name: str) -> bytes:
+    """Download PDF content from GCS"""
+    if not GCS_AVAILABLE or settings.USE_MOCK_DB:
+        if blob_name not in mock_storage:
+            raise FileNotFoundError(blob_name)
+        return mock_storage[blob_name]
+    
+    client = get_storage_client()
+    bucket = client.bucket(settings.GCS_BUCKET_NAME)
+    return bucket.blob(blob_name).download_as_bytes()
+
+def delete_pdfs(blob_names: list) -> dict:
+    """Delete PDFs from GCS in one batch; returns {blob_name: error} for failures"""
+    if not GCS_AVAILABLE or settings.USE_MOCK_DB:
+        for blob_name in blob_names:
             if blob_name in mock_storage:
                 del mock_storage[blob_name]
+                mock_storage_created.pop(blob_name, None)
                 print(f"🗑️  Mock PDF deleted: {blob_name}")
-            return
-        
-        client = get_storage_client()
-        bucket = client.bucket(settings.GCS_BUCKET_NAME)
-        blob = bucket.blob(blob_name)
-        blob.delete()
+        return {}
+    
+    client = get_storage_client()
+    bucket = client.bucket(settings.GCS_BUCKET_NAME)
+    try:
+        with client.batch():
+            for blob_name in blob_names:
+                bucket.delete_blob(blob_name)
+        return {}
     except Exception:
-        pass  # Ignore if file doesn't exist
+        pass
+    
+    # Something in the batch failed; retry one by one to find out what
+    failures = {}
+    for blob_name in blob_names:
+        try:
+            bucket.delete_blob(blob_name)
+        except NotFound:
+            pass  # Already gone
+        except Exception as e:
+            failures[blob_name] = str(e)
+    return failures
+
+def list_pdfs(prefix: str = "prompts/"):
+    """Yield (blob_name, created_timestamp) for every stored PDF"""
+    if not GCS_AVAILABLE or settings.USE_MOCK_DB:
+        for blob_name in list(mock_storage):
+            if blob_name.startswith(prefix):
+                yield blob_name, mock_storage_created.get(blob_name, 0.0)
+        return
+    
+    client = get_storage_client()
+    for blob in client.list_blobs(settings.GCS_BUCKET_NAME, prefix=prefix):
+        yield blob.name, blob.time_created.timestamp() if blob.time_created else 0.0
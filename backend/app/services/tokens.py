@@ -0,0 +1,111 @@
+from app.config import settings, DEFAULT_SESSION_SIGNING_KEYS
+from collections import OrderedDict
+import base64
+import hashlib
+import hmac
+import json
+import threading
+import time
+
+TOKEN_VERSION = "v1"
+
+
+class InvalidTokenError(Exception):
+    """Token is malformed, forged, signed with an unknown key or expired"""
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class TokenSigner:
+    """Issues and verifies HMAC-SHA256 signed session tokens.
+
+    Tokens look like ``v1.<key id>.<payload>.<signature>``. New tokens are
+    signed with the first configured key; every configured key is accepted
+    for verification, so keys can be rotated by prepending a new one and
+    dropping the old one once its tokens have expired. Recently verified
+    tokens are kept in a bounded LRU so repeat requests skip the HMAC.
+    """
+
+    def __init__(self, keys: dict, ttl_seconds: int, cache_size: int):
+        if not keys:
+            raise ValueError("At least one signing key is required")
+        if any("." in kid for kid in keys):
+            raise ValueError("Signing key ids cannot contain '.'")
+        self._keys = {kid: secret.encode() for kid, secret in keys.items()}
+        self._active_kid = next(iter(keys))
+        self._ttl = ttl_seconds
+        self._cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _sign(self, kid: str, signing_input: str) -> str:
+        digest = hmac.new(self._keys[kid], signing_input.encode(), hashlib.sha256).digest()
+        return _b64encode(digest)
+
+    def issue(self, claims: dict) -> str:
+        payload = {**claims, "exp": int(time.time()) + self._ttl}
+        body = _b64encode(json.dumps(payload, separators=(",", ":")).encode())
+        signing_input = f"{TOKEN_VERSION}.{self._active_kid}.{body}"
+        return f"{signing_input}.{self._sign(self._active_kid, signing_input)}"
+
+    def verify(self, token: str) -> dict:
+        """Return the token's claims or raise InvalidTokenError"""
+        now = time.time()
+        with self._lock:
+            cached = self._cache.get(token)
+            if cached is not None:
+                if cached["exp"] > now:
+                    self._cache.move_to_end(token)
+                    return cached
+                del self._cache[token]
+
+        try:
+            version, kid, body, signature = token.split(".")
+        except ValueError:
+            raise InvalidTokenError("Malformed token")
+        if version != TOKEN_VERSION or kid not in self._keys:
+            raise InvalidTokenError("Unknown token version or key")
+        expected = self._sign(kid, f"{version}.{kid}.{body}")
+        if not hmac.compare_digest(expected, signature):
+            raise InvalidTokenError("Bad signature")
+        try:
+            claims = json.loads(_b64decode(body))
+        except ValueError:
+            raise InvalidTokenError("Malformed payload")
+        if not isinstance(claims, dict) or claims.get("exp", 0) <= now:
+            raise InvalidTokenError("Token expired")
+
+        with self._lock:
+            self._cache[token] = claims
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return claims
+
+
+_signer = None
+
+
+def get_token_signer() -> TokenSigner:
+    global _signer
+    if _signer is None:
+        settings.require_secret("SESSION_SIGNING_KEYS", DEFAULT_SESSION_SIGNING_KEYS)
+        _signer = TokenSigner(
+            settings.SESSION_SIGNING_KEYS_MAP,
+            settings.SESSION_TTL_SECONDS,
+            settings.SESSION_CACHE_SIZE,
+        )
+    return _signer
+
+
+def issue_team_token(team_id: str, email: str) -> str:
+    return get_token_signer().issue({"role": "team", "teamId": team_id, "email": email})
+
+
+def issue_admin_token(judge_id: str) -> str:
+    return get_token_signer().issue({"role": "admin", "judgeId": judge_id})
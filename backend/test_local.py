@@ -4,6 +4,7 @@ Run after starting the server: python test_local.py
 """
 import requests
 import json
+import uuid
 
 BASE_URL = "http://localhost:8000"
 
@@ -18,9 +19,12 @@ def test_api():
     
     # Test 2: Team login
     print("2️⃣  Testing team login...")
+    email = f"test-{uuid.uuid4().hex[:8]}@example.com"
+    response = requests.post(f"{BASE_URL}/api/auth/generate-team", json={"leaderEmail": email})
+    team_id = response.json().get('teamId')
     login_data = {
-        "teamId": "TEAM-001",
-        "email": "test@example.com"
+        "teamId": team_id,
+        "email": email
     }
     response = requests.post(f"{BASE_URL}/api/auth/team-login", json=login_data)
     print(f"   Status: {response.status_code}")
@@ -61,7 +65,7 @@ def test_api():
     
     # Test 5: Admin login
     print("5️⃣  Testing admin login...")
-    admin_data = {"password": "admin123"}
+    admin_data = {"password": "admin123", "judgeId": "judge-1"}
     response = requests.post(f"{BASE_URL}/api/auth/admin-login", json=admin_data)
     print(f"   Status: {response.status_code}")
     admin_result = response.json()
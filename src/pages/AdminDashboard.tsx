@@ -1,6 +1,6 @@
 import { useState, useEffect } from "react";
 import { useNavigate } from "react-router-dom";
-import { adminApi, getAuthToken } from "@/services/api";
+import { adminApi, getAuthToken, getJudgeId } from "@/services/api";
 import Header from "@/components/Header";
 import FeatureList from "@/components/FeatureList";
 import TeamMemberList from "@/components/TeamMemberList";
@@ -54,7 +54,7 @@ const AdminDashboard = () => {
   });
 
   useEffect(() => {
-    if (!getAuthToken()) {
+    if (!getAuthToken() || !getJudgeId()) {
       navigate("/admin/login");
       return;
     }
@@ -94,9 +94,10 @@ const AdminDashboard = () => {
 
   const handleSelectProject = (project: Project) => {
     setSelected(project);
-    // Load existing scores or set to 0
-    if (project.scores) {
-      setScores(project.scores);
+    // Load this judge's existing scores or set to 0
+    const ownScores = project.judgeScores?.[getJudgeId() ?? ""];
+    if (ownScores) {
+      setScores(ownScores);
     } else {
       setScores({
         innovation: 0,
@@ -108,21 +109,23 @@ const AdminDashboard = () => {
   };
 
   const handleSaveScores = async () => {
-    if (!selected) return;
+    const judgeId = getJudgeId();
+    if (!selected || !judgeId) return;
 
     setSavingScores(true);
     try {
-      const result = await adminApi.updateScores(selected.id, scores);
+      const result = await adminApi.updateScores(selected.id, judgeId, scores);
+      const judgeScores = { ...selected.judgeScores, [judgeId]: scores };
       
       // Update local project data
       setProjects(projects.map(p => 
         p.id === selected.id 
-          ? { ...p, scores: result.scores, totalScore: result.totalScore }
+          ? { ...p, scores: result.scores, judgeScores, totalScore: result.totalScore }
           : p
       ));
       
       // Update selected project
-      setSelected({ ...selected, scores: result.scores, totalScore: result.totalScore });
+      setSelected({ ...selected, scores: result.scores, judgeScores, totalScore: result.totalScore });
       
       toast({
         title: "Scores saved! 🎉",
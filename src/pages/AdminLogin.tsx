@@ -12,6 +12,7 @@ const AdminLogin = () => {
   const navigate = useNavigate();
   const { toast } = useToast();
   const [password, setPassword] = useState("");
+  const [judgeId, setJudgeId] = useState("");
   const [error, setError] = useState("");
   const [loading, setLoading] = useState(false);
 
@@ -21,11 +22,15 @@ const AdminLogin = () => {
       setError("Enter a valid admin password");
       return;
     }
+    if (!judgeId.trim()) {
+      setError("Enter your judge name");
+      return;
+    }
 
     setLoading(true);
     setError("");
     try {
-      await authApi.adminLogin(password);
+      await authApi.adminLogin(password, judgeId.trim());
       toast({
         title: "Admin access granted",
         description: "Welcome to the admin panel",
@@ -55,6 +60,15 @@ const AdminLogin = () => {
         </CardHeader>
         <CardContent>
           <form onSubmit={handleSubmit} className="space-y-4">
+            <div className="space-y-1.5">
+              <Label htmlFor="judgeId">Judge name</Label>
+              <Input
+                id="judgeId"
+                value={judgeId}
+                onChange={(e) => setJudgeId(e.target.value)}
+                placeholder="e.g. alex"
+              />
+            </div>
             <div className="space-y-1.5">
               <Label htmlFor="adminPw">Password</Label>
               <Input
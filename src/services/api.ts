@@ -23,6 +23,20 @@ export const setAuthToken = (token: string | null) => {
 
 export const getAuthToken = () => authToken;
 
+// Judge identity for the current admin session
+let judgeId: string | null = localStorage.getItem("judgeId");
+
+export const setJudgeId = (id: string | null) => {
+  judgeId = id;
+  if (id) {
+    localStorage.setItem("judgeId", id);
+  } else {
+    localStorage.removeItem("judgeId");
+  }
+};
+
+export const getJudgeId = () => judgeId;
+
 // Helper function for API calls
 async function apiCall<T>(
   endpoint: string,
@@ -85,20 +99,22 @@ export const authApi = {
     return result;
   },
 
-  adminLogin: async (password: string) => {
-    const result = await apiCall<{ token: string; role: string }>(
+  adminLogin: async (password: string, judgeId: string) => {
+    const result = await apiCall<{ token: string; role: string; judgeId: string }>(
       "/api/auth/admin-login",
       {
         method: "POST",
-        body: JSON.stringify({ password }),
+        body: JSON.stringify({ password, judgeId }),
       }
     );
     setAuthToken(result.token);
+    setJudgeId(result.judgeId);
     return result;
   },
 
   logout: () => {
     setAuthToken(null);
+    setJudgeId(null);
   },
 };
 
@@ -128,27 +144,27 @@ export const projectsApi = {
     });
   },
 
-  uploadPdf: async (projectId: string, file: File): Promise<{ filename: string; url: string }> => {
-    const formData = new FormData();
-    formData.append("file", file);
-
-    const headers: HeadersInit = {};
-    if (authToken) {
-      headers["Authorization"] = `Bearer ${authToken}`;
-    }
+  uploadPdf: async (projectId: string, file: File): Promise<{ filename: string; blobName: string; url: string; status: string }> => {
+    // The API only signs the upload; the PDF goes straight to storage
+    const upload = await apiCall<{ blobName: string; uploadUrl: string; method: string; headers: Record<string, string> }>(
+      `/api/projects/${projectId}/upload-url`,
+      { method: "POST" }
+    );
 
-    const response = await fetch(`${API_BASE_URL}/api/projects/${projectId}/upload-pdf`, {
-      method: "POST",
-      headers,
-      body: formData,
+    const response = await fetch(upload.uploadUrl, {
+      method: upload.method,
+      headers: upload.headers,
+      body: file,
     });
 
     if (!response.ok) {
-      const error = await response.json().catch(() => ({ detail: "Upload failed" }));
-      throw new ApiError(response.status, error.detail || "Upload failed");
+      throw new ApiError(response.status, "Upload failed");
     }
 
-    return response.json();
+    return apiCall(`/api/projects/${projectId}/upload-complete`, {
+      method: "POST",
+      body: JSON.stringify({ blobName: upload.blobName, filename: file.name }),
+    });
   },
 };
 
@@ -168,15 +184,15 @@ export const adminApi = {
     return apiCall("/api/admin/stats");
   },
 
-  updateScores: async (projectId: string, scores: {
+  updateScores: async (projectId: string, judgeId: string, scores: {
     innovation: number;
     feasibility: number;
     uiUx: number;
     promptEfficiency: number;
-  }): Promise<{ message: string; scores: any; totalScore: number }> => {
+  }): Promise<{ message: string; judgeId: string; scores: any; totalScore: number }> => {
     return apiCall(`/api/admin/projects/${projectId}/scores`, {
       method: "PUT",
-      body: JSON.stringify(scores),
+      body: JSON.stringify({ ...scores, judgeId }),
     });
   },
 };
@@ -40,7 +40,8 @@ export interface Project {
   teamMembers?: TeamMember[];  // Optional for backward compatibility
   promptPdfName: string | null;
   promptPdfUrl?: string | null;
-  scores?: Scores | null;  // Scoring by admin
+  scores?: Scores | null;  // Mean of all judges' scores
+  judgeScores?: Record<string, Scores> | null;  // Scores keyed by judge
   totalScore?: number;  // Calculated total
   submittedAt: string;
 }